@@ -2,6 +2,6 @@
 """ Main bu_isciii package file.
 """
 
-import pkg_resources
+from importlib.metadata import version
 
-__version__ = pkg_resources.get_distribution("bu_isciii").version
+__version__ = version("bu_isciii")
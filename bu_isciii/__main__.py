@@ -1,37 +1,60 @@
 #!/usr/bin/env python
 
-# import sys
 import logging
 import os
+import sys
 
 import click
-import rich.console
 import rich.logging
-import rich.traceback
 
 import bu_isciii
 import bu_isciii.config_json
 import bu_isciii.utils
-import bu_isciii.new_service
-import bu_isciii.scratch
-import bu_isciii.list
-import bu_isciii.bioinfo_doc
-import bu_isciii.clean
-import bu_isciii.archive
-import bu_isciii.copy_sftp
-import bu_isciii.autoclean_sftp
+
+# Subcommand modules (and their heavy dependencies: sysrsync, jinja2, pdfkit,
+# requests...) are imported inside each command, so that only the invoked
+# subcommand pays its import cost and --help stays fast.
 
 log = logging.getLogger()
 
 
+# Invocations that only print the help or the version, sniffed before any
+# console setup so they skip the banner and the rich traceback handler
+NOOP_ARGUMENTS = ([], ["--help"], ["--version"])
+
+
+def sniff_noop_invocation(argv):
+    """
+    Check whether the command line only asks for the help or the version
+    """
+    return argv[1:] in NOOP_ARGUMENTS
+
+
+def sniff_verbose_invocation(argv):
+    """
+    Check whether the verbose flag was given, before click parses it
+    """
+    return "-v" in argv[1:] or "--verbose" in argv[1:]
+
+
 def run_bu_isciii():
+    if sniff_noop_invocation(sys.argv):
+        bu_isciii_cli()
+        return
+
     # Set up rich stderr console
-    stderr = rich.console.Console(
-        stderr=True, force_terminal=bu_isciii.utils.rich_force_colors()
-    )
+    stderr = bu_isciii.utils.stderr_plain
+
+    # Set up the rich traceback only where someone will read it: an interactive
+    # terminal, a verbose run or BU_ISCIII_DEBUG set in the environment
+    if (
+        stderr.is_terminal
+        or sniff_verbose_invocation(sys.argv)
+        or os.environ.get("BU_ISCIII_DEBUG")
+    ):
+        from rich.traceback import install as install_rich_traceback
 
-    # Set up the rich traceback
-    rich.traceback.install(console=stderr, width=200, word_wrap=True, extra_lines=1)
+        install_rich_traceback(console=stderr, width=200, word_wrap=True, extra_lines=1)
 
     # Print nf-core header
     # stderr.print("\n[green]{},--.[grey39]/[green],-.".format(" " * 42), highlight=False)
@@ -153,6 +176,16 @@ def bu_isciii_cli(ctx, verbose, log_file, api_user, api_password, cred_file, dev
         )
         log.addHandler(log_fh)
 
+    # Per-service progress is logged, print it to the console too if verbose
+    if verbose:
+        log.addHandler(
+            rich.logging.RichHandler(
+                level=logging.INFO,
+                console=bu_isciii.utils.stderr_plain,
+                show_time=False,
+            )
+        )
+
     if dev:
         conf = bu_isciii.config_json.ConfigJson(
             json_file=os.path.join(
@@ -186,6 +219,8 @@ def list(ctx, service):
     """
     List available bu-isciii services.
     """
+    import bu_isciii.list
+
     service_list = bu_isciii.list.ListServices()
     service_list.print_table(service)
 
@@ -219,6 +254,8 @@ def new_service(ctx, resolution, path, no_create_folder, ask_path):
     """
     Create new service, it will create folder and copy template depending on selected service.
     """
+    import bu_isciii.new_service
+
     new_ser = bu_isciii.new_service.NewService(
         resolution,
         path,
@@ -271,6 +308,8 @@ def scratch(ctx, resolution, path, tmp_dir, direction, ask_path):
     """
     Copy service folder to scratch directory for execution.
     """
+    import bu_isciii.scratch
+
     scratch_copy = bu_isciii.scratch.Scratch(
         resolution,
         path,
@@ -330,6 +369,8 @@ def clean(ctx, resolution, path, ask_path, option):
     Service cleaning. It will either remove big files, rename folders before copy, revert this renaming,
     show removable files or show folders for no copy.
     """
+    import bu_isciii.clean
+
     clean = bu_isciii.clean.CleanUp(
         resolution,
         path,
@@ -371,6 +412,8 @@ def copy_sftp(ctx, resolution, path, ask_path, sftp_folder):
     """
     Copy resolution FOLDER to sftp, change status of resolution in iskylims and generate md, pdf, html.
     """
+    import bu_isciii.copy_sftp
+
     new_del = bu_isciii.copy_sftp.CopySftp(
         resolution,
         path,
@@ -419,6 +462,10 @@ def finish(ctx, resolution, path, ask_path, sftp_folder, tmp_dir):
     """
     Service cleaning, remove big files, rename folders before copy and copy resolution FOLDER to sftp.
     """
+    import bu_isciii.clean
+    import bu_isciii.scratch
+    import bu_isciii.copy_sftp
+
     print("Starting cleaning scratch directory: " + tmp_dir)
     clean_scratch = bu_isciii.clean.CleanUp(
         resolution,
@@ -534,7 +581,10 @@ def bioinfo_doc(
     """
     Create the folder documentation structure in bioinfo_doc server
     """
+    import bu_isciii.bioinfo_doc
+
     email_pass = email_psswd if email_psswd else ctx.obj.get("email_password")
+
     new_doc = bu_isciii.bioinfo_doc.BioinfoDoc(
         type,
         resolution,
@@ -593,6 +643,12 @@ def bioinfo_doc(
     default=None,
     help="Tsv output path + filename with archive stats and info",
 )
+@click.option(
+    "-dc",
+    "--deep_compare",
+    is_flag=True,
+    help="Compare file contents, not only sizes and dates, before removing services from data dir",
+)
 @click.pass_context
 def archive(
     ctx,
@@ -604,10 +660,13 @@ def archive(
     date_from,
     date_until,
     output_name,
+    deep_compare,
 ):
     """
     Archive services or retrieve services from archive
     """
+    import bu_isciii.archive
+
     archive_ser = bu_isciii.archive.Archive(
         service_id,
         service_file,
@@ -620,6 +679,7 @@ def archive(
         date_from,
         date_until,
         output_name,
+        deep_compare,
     )
     archive_ser.handle_archive()
 
@@ -643,6 +703,8 @@ def archive(
 @click.pass_context
 def autoclean_sftp(ctx, sftp_folder, days):
     """Clean old sftp services"""
+    import bu_isciii.autoclean_sftp
+
     sftp_clean = bu_isciii.autoclean_sftp.AutoremoveSftpService(
         sftp_folder, days, ctx.obj["conf"]
     )
@@ -669,9 +731,7 @@ def fix_permissions(ctx, input_directory):
     conf = bu_isciii.config_json.ConfigJson()
     permissions = conf.get_configuration("global").get("permissions")
     bu_isciii.utils.remake_permissions(input_directory, permissions)
-    stderr = rich.console.Console(
-        stderr=True, force_terminal=bu_isciii.utils.rich_force_colors()
-    )
+    stderr = bu_isciii.utils.stderr_plain
     stderr.print(f"[green]Correct permissions were applied to {input_directory}")
 
 
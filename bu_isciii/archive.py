@@ -1,13 +1,14 @@
 #!/usr/bin/env python
 
+import concurrent.futures
+import functools
 import logging
 import os
 import shutil
 import sys
-from math import pow
 
-import rich
-import sysrsync
+import rich.console
+import rich.table
 
 import bu_isciii
 import bu_isciii.config_json
@@ -15,12 +16,14 @@ import bu_isciii.drylab_api
 import bu_isciii.utils
 
 log = logging.getLogger(__name__)
-stderr = rich.console.Console(
-    stderr=True,
-    style="dim",
-    highlight=False,
-    force_terminal=bu_isciii.utils.rich_force_colors(),
-)
+stderr = bu_isciii.utils.stderr
+
+# Sizes are reported in GB (1024^3 bytes)
+BYTES_IN_GB = 1024**3
+
+# Status of the compression, copy and uncompression of services whose
+# directory is already in the destiny with the same files
+IDENTICAL_COPY_FOUND = "Skipped, identical copy already found in destiny"
 
 
 class Archive:
@@ -42,6 +45,7 @@ class Archive:
         date_from=None,
         date_until=None,
         output_name=None,
+        deep_compare=False,
     ):
         log.info("Activated archive module of the bu-isciii tools")
 
@@ -76,6 +80,24 @@ class Archive:
         # Get configuration params from configuration.json
         # Get data to connect to the API
         self.conf = conf.get_configuration("archive")
+        # Integrity checksums of the compressed files, md5 unless configured
+        self.checksum_algorithm = self.conf.get("checksum_algorithm", "md5")
+        try:
+            bu_isciii.utils.new_checksum_hash(self.checksum_algorithm)
+        except (ImportError, ValueError) as e:
+            stderr.print(
+                f"[red]ERROR: Checksum algorithm '{self.checksum_algorithm}' "
+                f"set in the configuration is not available: {e}"
+            )
+            sys.exit(1)
+        # Services compressed/uncompressed at once, and copies running at once
+        self.parallel_jobs = self.conf.get("parallel_jobs", min(4, os.cpu_count() or 1))
+        self.max_parallel_rsync = self.conf.get("max_parallel_rsync", 4)
+        # Directory trees walked at once when scouting sizes
+        self.parallel_scans = self.conf.get("parallel_scans", 16)
+        # Services deleted at once
+        self.parallel_delete = max(1, int(self.conf.get("parallel_delete", 1)))
+        self.rmtree = bu_isciii.utils.get_rmtree(self.parallel_delete)
         conf_api = conf.get_configuration("api_settings")
 
         # Initiate API
@@ -87,6 +109,7 @@ class Archive:
         )
 
         self.skip_prompts = skip_prompts
+        self.deep_compare = deep_compare
         self.option = option
         self.date_from = date_from
         self.date_until = date_until
@@ -114,37 +137,30 @@ class Archive:
             )
             sys.exit()
 
-        if (
-            (
-                (date_from is not None)
-                and (date_until is not None)
-                and (service_id is not None)
-            )
-            or (
-                (date_from is not None)
-                and (date_until is not None)
-                and (services_file is not None)
+        # Keep only one of the search criteria given through the command line
+        given_criteria = [
+            criterion
+            for criterion, given in (
+                ("Search by date", date_from is not None and date_until is not None),
+                ("Search by ID", service_id is not None),
+                ("Search using file", services_file is not None),
             )
-            or ((services_file) is not None and (service_id) is not None)
-        ):
+            if given
+        ]
+        if len(given_criteria) > 1:
             stderr.print(
                 "Both a date and a service ID or service list have been chosen. "
             )
             prompt_response = bu_isciii.utils.prompt_selection(
-                "Which one would you like to keep?",
-                ["Search by date", "Search by ID", "Search using file"],
+                "Which one would you like to keep?", given_criteria
             )
-            if (prompt_response) == "Search by date":
-                service_id = None
-                services_file = None
-            elif (prompt_response) == "Search by ID":
-                date_from = None
-                date_until = None
-                services_file = None
-            elif (prompt_response) == "Search using file":
+            if prompt_response != "Search by date":
                 date_from = None
                 date_until = None
+            if prompt_response != "Search by ID":
                 service_id = None
+            if prompt_response != "Search using file":
+                services_file = None
 
         if (
             (date_from is None)
@@ -176,11 +192,7 @@ class Archive:
                 )
             elif prompt_response == "Service ID":
                 service_id = bu_isciii.utils.prompt_service_id()
-                self.services = {
-                    service_id: {
-                        key: value for key, value in dictionary_template.items()
-                    }
-                }
+                self.services = {service_id: dict(dictionary_template)}
                 log.info(f"Chosen service: {service_id} (chosen through prompt)")
 
                 # Ask if more services will be chosen
@@ -193,9 +205,7 @@ class Archive:
                         break
                     else:
                         new_service = bu_isciii.utils.prompt_service_id()
-                        self.services[new_service] = {
-                            key: value for key, value in dictionary_template.items()
-                        }
+                        self.services[new_service] = dict(dictionary_template)
                         log.info(
                             f"Chosen service: {new_service} (chosen through prompt)"
                         )
@@ -203,21 +213,12 @@ class Archive:
             self.date_from = date_from
             self.date_until = date_until
             if service_id:
-                self.services = (
-                    {
-                        service_id: {
-                            key: value for key, value in dictionary_template.items()
-                        }
-                    }
-                    if service_id is not None
-                    else dict()
-                )
+                self.services = {service_id: dict(dictionary_template)}
             elif services_file:
                 with open(services_file) as file:
                     for s_id in file:
-                        self.services[s_id] = {
-                            key: value for key, value in dictionary_template.items()
-                        }
+                        if s_id.strip():
+                            self.services[s_id.strip()] = dict(dictionary_template)
 
         if (self.date_from is not None) and (self.date_until is not None):
             stderr.print("Asking our trusty API about selected services")
@@ -230,19 +231,15 @@ class Archive:
                     date_until=str(self.date_until),
                 ):
                     self.services[service["service_request_number"]] = {
-                        key: value for key, value in dictionary_template.items()
+                        **dictionary_template,
+                        "found_in_system": True,
+                        "delivery_date": service["service_delivered_date"],
                     }
-                    self.services[service["service_request_number"]][
-                        "found_in_system"
-                    ] = True
-                    self.services[service["service_request_number"]][
-                        "delivery_date"
-                    ] = service["service_delivered_date"]
 
                 log.info(f"Services found in the time interval: {len(self.services)}")
                 log.info(
                     "Names of the services found in said interval:"
-                    f"{','.join([service for service in self.services.keys()])}"
+                    f"{','.join(self.services)}"
                 )
             except TypeError:
                 stderr.print(
@@ -253,15 +250,34 @@ class Archive:
                 )
                 sys.exit(1)
 
+        # Paths are built as <root>/<type>/[<center>/<area>/]<service>
+        global_conf = conf.get_configuration("global")
+        archived_root = os.path.join(global_conf["archived_path"], self.ser_type)
+        non_archived_root = os.path.join(global_conf["data_path"], self.ser_type)
+
+        # Service data is fetched with one API request per service. Requests are
+        # bound by network latency, so they are sent concurrently, up to the
+        # configured number at once to avoid flooding the API
+        service_requests = {}
+        if self.ser_type == "services_and_colaborations":
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.conf.get("parallel_api_requests", 16)
+            ) as executor:
+                service_requests = {
+                    service: executor.submit(
+                        rest_api.get_request,
+                        request_info="service-data",
+                        safe=True,
+                        service=service,
+                    )
+                    for service in self.services.keys()
+                }
+
         for service in self.services.keys():
-            stderr.print(service)
+            log.debug("Resolving paths for service %s", service)
             if self.ser_type == "services_and_colaborations":
                 if isinstance(
-                    (
-                        service_data := rest_api.get_request(
-                            request_info="service-data", safe=True, service=service
-                        )
-                    ),
+                    (service_data := service_requests[service].result()),
                     int,
                 ):
                     stderr.print(
@@ -272,33 +288,34 @@ class Archive:
                     self.services[service]["non_archived_path"] = None
                 else:
                     self.services[service]["found_in_system"] = True
-                    self.services[service]["archived_path"] = os.path.join(
-                        bu_isciii.utils.get_service_paths(
-                            conf, self.ser_type, service_data, "archived_path"
-                        ),
+                    service_path = os.path.join(
+                        bu_isciii.utils.get_service_user_path(service_data),
                         service_data["resolutions"][0]["resolution_full_number"],
                     )
-
+                    self.services[service]["archived_path"] = os.path.join(
+                        archived_root, service_path
+                    )
                     self.services[service]["non_archived_path"] = os.path.join(
-                        bu_isciii.utils.get_service_paths(
-                            conf, self.ser_type, service_data, "non_archived_path"
-                        ),
-                        service_data["resolutions"][0]["resolution_full_number"],
+                        non_archived_root, service_path
                     )
             else:
                 self.services[service]["found_in_system"] = True
                 self.services[service]["archived_path"] = os.path.join(
-                    conf.get_configuration("global")["archived_path"],
-                    self.ser_type,
-                    service_id,
+                    archived_root, service
                 )
                 self.services[service]["non_archived_path"] = os.path.join(
-                    conf.get_configuration("global")["data_path"],
-                    self.ser_type,
-                    service_id,
+                    non_archived_root, service
                 )
 
-            self.services[service]["found"] = []
+            # Check on the directories to get location and whether or not it was found
+            self.services[service]["found"] = [
+                location
+                for location, path in (
+                    ("Archive", self.services[service]["archived_path"]),
+                    ("Data dir", self.services[service]["non_archived_path"]),
+                )
+                if path is not None and os.path.exists(path)
+            ]
 
         # Check on not-found services
         not_found_services = [
@@ -340,16 +357,6 @@ class Archive:
                         )
                         sys.exit(0)
 
-        # Check on the directories to get location and whether or not it was found
-        stderr.print("Finding the services in the directory tree")
-
-        for service in self.services.keys():
-            if os.path.exists(self.services[service]["archived_path"]):
-                self.services[service]["found"].append("Archive")
-
-            if os.path.exists(self.services[service]["non_archived_path"]):
-                self.services[service]["found"].append("Data dir")
-
         if option is None:
             stderr.print("Willing to archive, or retrieve a resolution?")
             self.option = bu_isciii.utils.prompt_selection(
@@ -389,26 +396,36 @@ class Archive:
         size_table.add_column("Directory size (GB)", justify="center")
         size_table.add_column("Found in", justify="center")
 
+        # Walking the directories is bound by stat syscalls, which release the GIL,
+        # so sizes for all services are obtained concurrently
+        dirs_to_size = {}
         for service in self.services.keys():
             if "Data dir" in self.services[service]["found"]:
-                self.services[service]["non_archived_size"] = (
-                    bu_isciii.utils.get_dir_size(
-                        self.services[service]["non_archived_path"]
-                    )
-                    / pow(1024, 3)
-                )
+                dirs_to_size[(service, "non_archived_size")] = self.services[service][
+                    "non_archived_path"
+                ]
             if "Archive" in self.services[service]["found"]:
-                self.services[service]["archived_size"] = bu_isciii.utils.get_dir_size(
-                    self.services[service]["archived_path"]
-                ) / pow(1024, 3)
+                dirs_to_size[(service, "archived_size")] = self.services[service][
+                    "archived_path"
+                ]
 
-            if (
-                self.services[service]["archived_size"]
-                == self.services[service]["non_archived_size"]
-            ):
-                self.services[service]["same_size"] = True
-            else:
-                self.services[service]["same_size"] = False
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.parallel_scans
+        ) as executor:
+            dir_sizes = dict(
+                zip(
+                    dirs_to_size.keys(),
+                    executor.map(bu_isciii.utils.get_dir_size, dirs_to_size.values()),
+                )
+            )
+        for (service, size_key), dir_size in dir_sizes.items():
+            self.services[service][size_key] = dir_size / BYTES_IN_GB
+
+        for service in self.services.keys():
+            # Sizes are compared in bytes, not as rounded GB floats
+            self.services[service]["same_size"] = dir_sizes.get(
+                (service, "archived_size"), 0
+            ) == dir_sizes.get((service, "non_archived_size"), 0)
 
             if size_table.row_count < 10:
                 size_table.add_row(
@@ -444,10 +461,12 @@ class Archive:
         )
 
         total_initial_size = 0
-        total_compressed_size = 0
+        total_compressed_bytes = 0
         newly_compressed_services = []
+        # service: directory to compress
+        dirs_to_tar = {}
+        size_key = "non_archived_size" if direction == "archive" else "archived_size"
 
-        # try:
         for service in self.services.keys():
             location_check = "Data dir" if direction == "archive" else "Archive"
             if location_check not in self.services[service]["found"]:
@@ -456,19 +475,35 @@ class Archive:
                 )
                 continue
 
-            dir_to_tar = (
-                self.services[service]["non_archived_path"]
+            dir_to_tar, dir_in_destiny = (
+                (
+                    self.services[service]["non_archived_path"],
+                    self.services[service]["archived_path"],
+                )
                 if direction == "archive"
-                else self.services[service]["archived_path"]
+                else (
+                    self.services[service]["archived_path"],
+                    self.services[service]["non_archived_path"],
+                )
             )
 
-            # If dir size has been obtained previously, get it
-            # if dir could not be found, pass
-            # This could very much be a function on its own
-            if direction == "archive":
-                initial_size = self.services[service]["non_archived_size"]
-            else:
-                initial_size = self.services[service]["archived_size"]
+            # On re-runs, services already copied to the destiny need no work
+            destiny_location = "Archive" if direction == "archive" else "Data dir"
+            if destiny_location in self.services[service]["found"]:
+                try:
+                    identical = bu_isciii.utils.dir_comparison(
+                        dir_to_tar, dir_in_destiny
+                    )
+                except OSError:
+                    identical = False
+                if identical:
+                    log.info(
+                        f"Service {service}: {dir_in_destiny} already holds the same files "
+                        f"as {dir_to_tar}. Skipping compression, copy and uncompression."
+                    )
+                    for step in ("compressed", "copied", "uncompressed"):
+                        self.services[service][step] = IDENTICAL_COPY_FOUND
+                    continue
 
             # Check if there is a prior ".tar.gz" file
             # NOTE: I find dir_to_tar + ".tar.gz" easier to mentally locate the compressed files
@@ -493,49 +528,87 @@ class Archive:
                         ],
                     )
 
-            try:
-                if prompt_response:
-                    if prompt_response.startswith("Delete"):
-                        log.info(
-                            f"Service {service}: compressed service {dir_to_tar + '.tar.gz'} was already found."
-                            f"Option chosen is to DELETE it ({message})"
-                            "Compression process will be performed again."
-                        )
-                        os.remove(dir_to_tar + ".tar.gz")
-                    else:
-                        self.services[service][
-                            "compressed"
-                        ] = "Found already compressed"
-
-                if (
-                    not self.services[service]["compressed"]
-                    == "Found already compressed"
-                ):
-                    stderr.print(f"Compressing service {service}")
-                    bu_isciii.utils.targz_dir(dir_to_tar + ".tar.gz", dir_to_tar)
-                    self.services[service]["compressed"] = "Successfully compressed"
+            if prompt_response:
+                if prompt_response.startswith("Delete"):
+                    log.info(
+                        f"Service {service}: compressed service {dir_to_tar + '.tar.gz'} was already found."
+                        f"Option chosen is to DELETE it ({message})"
+                        "Compression process will be performed again."
+                    )
+                    os.remove(dir_to_tar + ".tar.gz")
+                else:
+                    self.services[service]["compressed"] = "Found already compressed"
 
-            except Exception as e:
-                stderr.print(
-                    f"Compression of service {service} had an error and couldnt be ended."
-                    "Deleting compressed file and skipping to the next one\n."
-                    f"{e}"
+            # If dir size has been obtained previously (scouting), reuse it.
+            # Otherwise it is tallied while tarring, or got now if the service
+            # is not going to be tarred, and kept for the tsv table
+            if (
+                not self.services[service][size_key]
+                and self.services[service]["compressed"] == "Found already compressed"
+            ):
+                self.services[service][size_key] = (
+                    bu_isciii.utils.get_dir_size(dir_to_tar) / BYTES_IN_GB
                 )
+            dirs_to_tar[service] = dir_to_tar
+
+        # Services are independent, and gzip releases the GIL while compressing,
+        # so a few services are compressed at once
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.parallel_jobs
+        ) as executor:
+            compressions = {}
+            for service, dir_to_tar in dirs_to_tar.items():
+                if self.services[service]["compressed"] == "Found already compressed":
+                    continue
+                log.info(f"Service {service}: compressing {dir_to_tar}")
+                compressions[
+                    executor.submit(
+                        bu_isciii.utils.targz_dir,
+                        dir_to_tar + ".tar.gz",
+                        dir_to_tar,
+                        algorithm=self.checksum_algorithm,
+                        compresslevel=self.conf.get("compression_level", 6),
+                    )
+                ] = service
+            stderr.print(f"Compressing {len(compressions)} services")
+
+            for compression in concurrent.futures.as_completed(compressions):
+                service = compressions[compression]
+                dir_to_tar = dirs_to_tar[service]
+                try:
+                    compressed_md5, tarred_bytes = compression.result()
+                except Exception as e:
+                    stderr.print(
+                        f"Compression of service {service} had an error and couldnt be ended."
+                        "Deleting compressed file and skipping to the next one\n."
+                        f"{e}"
+                    )
 
-                if os.path.exists(dir_to_tar + ".tar.gz"):
-                    os.remove(dir_to_tar + ".tar.gz")
+                    if os.path.exists(dir_to_tar + ".tar.gz"):
+                        os.remove(dir_to_tar + ".tar.gz")
 
-                log.info(
-                    f"Service {service}: when compressing, a {e} error arised. Ending compression,"
-                    "deleting compressed file and skipping to the next service."
-                )
-                self.services[service][
-                    "error_status"
-                ] = f"Error while compressing the directory: {e}"
+                    log.info(
+                        f"Service {service}: when compressing, a {e} error arised. Ending compression,"
+                        "deleting compressed file and skipping to the next service."
+                    )
+                    self.services[service][
+                        "error_status"
+                    ] = f"Error while compressing the directory: {e}"
+                    del dirs_to_tar[service]
+                    continue
 
-                continue
+                self.services[service]["compressed"] = "Successfully compressed"
+                if not self.services[service][size_key]:
+                    self.services[service][size_key] = tarred_bytes / BYTES_IN_GB
+                if direction == "archive":
+                    self.services[service]["md5_non_archived"] = compressed_md5
+                else:
+                    self.services[service]["md5_archived"] = compressed_md5
 
-            compressed_size = os.path.getsize(dir_to_tar + ".tar.gz") / pow(1024, 3)
+        for service, dir_to_tar in dirs_to_tar.items():
+            initial_size = self.services[service][size_key]
+            compressed_bytes = os.path.getsize(dir_to_tar + ".tar.gz")
+            compressed_size = compressed_bytes / BYTES_IN_GB
 
             if direction == "archive":
                 self.services[service]["non_archived_compressed_size"] = compressed_size
@@ -543,17 +616,16 @@ class Archive:
                 self.services[service]["archived_compressed_size"] = compressed_size
 
             total_initial_size += initial_size
-            total_compressed_size += compressed_size
+            total_compressed_bytes += compressed_bytes
 
-            stderr.print(
-                f"Service {service} is compressed into {dir_to_tar + '.tar.gz'}"
-            )
             log.info(
                 f"Service {service}: compression into {dir_to_tar + '.tar.gz'} successful."
                 f"Initial size: {initial_size:.3f} GB. Compressed size: {compressed_size:.3f} GB."
                 f"Saved space: {initial_size - compressed_size:.3f} GB."
             )
 
+        total_compressed_size = total_compressed_bytes / BYTES_IN_GB
+
         # General revision of the compression process
         newly_compressed_services = [
             service
@@ -566,21 +638,15 @@ class Archive:
             if self.services[service]["compressed"] == "Found already compressed"
         ]
 
-        stderr.print("Compression finished")
         stderr.print(
+            "Compression finished\n"
             f"Compressed {len(newly_compressed_services + already_compressed_services)} services "
             f"({len(newly_compressed_services)} newly compressed,"
-            f"{len(already_compressed_services)} already compressed)"
-        )
-        stderr.print(f"Total initial size: {total_initial_size:.3f} GB")
-        stderr.print(f"Total compressed size: {total_compressed_size:.3f} GB")
-        stderr.print(
-            f"Saved space: {total_initial_size - total_compressed_size:.3f} GB"
-        )
-        stderr.print(
-            f"Newly compressed services: {', '.join(newly_compressed_services)}"
-        )
-        stderr.print(
+            f"{len(already_compressed_services)} already compressed)\n"
+            f"Total initial size: {total_initial_size:.3f} GB\n"
+            f"Total compressed size: {total_compressed_size:.3f} GB\n"
+            f"Saved space: {total_initial_size - total_compressed_size:.3f} GB\n"
+            f"Newly compressed services: {', '.join(newly_compressed_services)}\n"
             f"Already compressed services: {', '.join(already_compressed_services)}"
         )
 
@@ -616,7 +682,15 @@ class Archive:
             f"({('Data dir to Archive' if direction == 'archive' else 'Archive to Data dir' )})"
         )
 
+        # service: (origin, destiny, origin_md5)
+        transfers = {}
+        # (origin folder, destiny folder): [services]
+        transfer_groups = {}
+
         for service in self.services.keys():
+            if self.services[service]["copied"] == IDENTICAL_COPY_FOUND:
+                continue
+
             # check if errors, skip
             location_check = "Data dir" if direction == "archive" else "Archive"
             if (
@@ -642,8 +716,8 @@ class Archive:
 
             if not (os.path.exists(origin + ".tar.gz")):
                 stderr.print(
-                    f"{origin.split('/')[-1] + 'tar.gz'} was not found "
-                    f"in the origin directory ({'/'.join(origin.split('/')[:-1])}"
+                    f"{os.path.basename(origin) + '.tar.gz'} was not found "
+                    f"in the origin directory ({os.path.dirname(origin)}"
                 )
 
                 self.services[service][
@@ -715,76 +789,139 @@ class Archive:
                     ] = "Compressed directory found in destiny. Skipped."
                     continue
 
-            origin_md5 = bu_isciii.utils.get_md5(origin + ".tar.gz")
-
-            # save origin md5
-            if direction == "archive":
-                self.services[service]["md5_non_archived"] = origin_md5
+            # A file compressed in this run already had its md5 digested while
+            # being written, no need to read it again
+            origin_md5_key = (
+                "md5_non_archived" if direction == "archive" else "md5_archived"
+            )
+            if (
+                self.services[service]["compressed"] == "Successfully compressed"
+                and self.services[service][origin_md5_key]
+            ):
+                origin_md5 = self.services[service][origin_md5_key]
             else:
-                self.services[service]["md5_archived"] = origin_md5
-
-            try:
-                sysrsync.run(
-                    source=origin + ".tar.gz",
-                    destination=destiny + ".tar.gz",
-                    options=self.conf["options"],
-                    sync_source_contents=False,
+                origin_md5 = bu_isciii.utils.get_checksum(
+                    origin + ".tar.gz", self.checksum_algorithm
                 )
-                destiny_md5 = bu_isciii.utils.get_md5(destiny + ".tar.gz")
 
-                # save destiny md5
-                if direction == "archive":
-                    self.services[service]["md5_archived"] = destiny_md5
-                else:
-                    self.services[service]["md5_non_archived"] = destiny_md5
-
-                # compare md5
-                if origin_md5 == destiny_md5:
-                    stderr.print(
-                        f"[green] Service {service}: Data copied successfully from its origin folder ({origin}) "
-                        f"to its destiny folder ({destiny}) (MD5: {origin_md5}; identical in both sides)",
-                        highlight=False,
-                    )
-                    log.info(
-                        f"Service {service}: copied successfully from {origin}.tar.gz to {destiny}.tar.gz."
-                        f" MD5: {origin_md5}, identical in both sides.)"
-                    )
-                    self.services[service][
-                        "copied"
-                    ] = f"Successfully copied (direction: {direction}), with matching MD5"
-                    os.remove(origin + ".tar.gz")
-                    log.info(f"Service {service}: deleted {origin}.tar.gz")
-                else:
-                    stderr.print(
-                        f"[red] ERROR: Service {service}: Data copied from its origin folder ({origin}) "
-                        f"to its destiny folder ({destiny}), but MD5 did not match (Origin MD5: {origin_md5}; "
-                        f"Destiny MD5: {destiny_md5})."
-                    )
-                    log.info(
-                        f"Service {service}: data copied from its origin folder ({origin}) to its "
-                        f"destiny folder ({destiny}), but MD5 did not match "
-                        f"(Origin MD5: {origin_md5}; Destiny MD5: {destiny_md5})."
+                # save origin md5
+                self.services[service][origin_md5_key] = origin_md5
+
+            # Archived and non archived paths share their last component, so services
+            # with the same origin and destiny folders are copied together
+            transfers[service] = (origin, destiny, origin_md5)
+            transfer_groups.setdefault(
+                (os.path.dirname(origin), os.path.dirname(destiny)), []
+            ).append(service)
+
+        # Outcomes are printed as one table once every copy is finished, so
+        # messages of concurrent groups do not interleave
+        copy_table = rich.table.Table()
+        copy_table.add_column("Service ID", justify="center")
+        copy_table.add_column("Copy status", justify="center")
+        copy_table.add_column("Details", justify="left")
+
+        # Groups are independent and bound by disk/network bandwidth, so a few
+        # copies run at once
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_parallel_rsync
+        ) as executor:
+            group_copies = {
+                executor.submit(
+                    self.copy_files,
+                    origin_dir,
+                    destiny_dir,
+                    [
+                        os.path.basename(transfers[service][0]) + ".tar.gz"
+                        for service in group_services
+                    ],
+                ): (origin_dir, destiny_dir, group_services)
+                for (origin_dir, destiny_dir), group_services in transfer_groups.items()
+            }
+            for group_copy in concurrent.futures.as_completed(group_copies):
+                origin_dir, destiny_dir, group_services = group_copies[group_copy]
+                try:
+                    group_copy.result()
+                except Exception as e:
+                    log.error(
+                        f"Services {', '.join(group_services)} could not be copied "
+                        f"from {origin_dir} to {destiny_dir}. Reason: {e}"
                     )
+                    for service in group_services:
+                        self.services[service][
+                            "error_status"
+                        ] = f"Error while copying the compressed directory: {e}"
+                        copy_table.add_row(
+                            service,
+                            "[red]ERROR",
+                            f"Could not be copied from {origin_dir} to {destiny_dir}",
+                        )
+                    continue
 
-                    self.services[service][
-                        "copied"
-                    ] = f"Copied (direction: {direction}), MD5 NOT MATCHING."
+                for service in group_services:
+                    origin, destiny, origin_md5 = transfers[service]
+                    try:
+                        destiny_md5 = bu_isciii.utils.get_checksum(
+                            destiny + ".tar.gz", self.checksum_algorithm
+                        )
 
-                    self.services[service][
-                        "error_status"
-                    ] = "Copy error md5sum not matching"
-                    os.remove(destiny + ".tar.gz")
-                    log.info(f"Service {service}: deleted {destiny}.tar.gz")
+                        # save destiny md5
+                        if direction == "archive":
+                            self.services[service]["md5_archived"] = destiny_md5
+                        else:
+                            self.services[service]["md5_non_archived"] = destiny_md5
+
+                        # compare md5
+                        if origin_md5 == destiny_md5:
+                            copy_table.add_row(
+                                service,
+                                "[green]Copied",
+                                f"{origin} -> {destiny} (MD5: {origin_md5}; identical in both sides)",
+                            )
+                            log.info(
+                                f"Service {service}: copied successfully from {origin}.tar.gz to {destiny}.tar.gz."
+                                f" MD5: {origin_md5}, identical in both sides.)"
+                            )
+                            self.services[service][
+                                "copied"
+                            ] = f"Successfully copied (direction: {direction}), with matching MD5"
+                            os.remove(origin + ".tar.gz")
+                            log.info(f"Service {service}: deleted {origin}.tar.gz")
+                        else:
+                            copy_table.add_row(
+                                service,
+                                "[red]ERROR",
+                                f"{origin} -> {destiny}, but MD5 did not match "
+                                f"(Origin MD5: {origin_md5}; Destiny MD5: {destiny_md5})",
+                            )
+                            log.info(
+                                f"Service {service}: data copied from its origin folder ({origin}) to its "
+                                f"destiny folder ({destiny}), but MD5 did not match "
+                                f"(Origin MD5: {origin_md5}; Destiny MD5: {destiny_md5})."
+                            )
+
+                            self.services[service][
+                                "copied"
+                            ] = f"Copied (direction: {direction}), MD5 NOT MATCHING."
+
+                            self.services[service][
+                                "error_status"
+                            ] = "Copy error md5sum not matching"
+                            os.remove(destiny + ".tar.gz")
+                            log.info(f"Service {service}: deleted {destiny}.tar.gz")
+
+                    except Exception as e:
+                        copy_table.add_row(
+                            service,
+                            "[red]ERROR",
+                            f"{os.path.basename(origin)}.tar.gz could not be copied to {destiny}",
+                        )
+                        log.error(
+                            f"Directory {origin} could not be archived to {destiny}.Reason: {e}"
+                        )
 
-            except Exception as e:
-                stderr.print(
-                    f"[red] ERROR: {origin.split('/')[-1] + '.tar.gz'} "
-                    f"could not be copied to its destiny archive folder, {destiny}.",
-                    highlight=False,
-                )
-                log.error(
-                    f"Directory {origin} could not be archived to {destiny}.Reason: {e}"
-                )
+        if copy_table.row_count > 0:
+            stderr.print(copy_table)
 
         log.info(
             f"FINISHED: Compressed service movement "
@@ -792,6 +929,54 @@ class Archive:
         )
         return
 
+    def copy_files(self, origin_dir, destiny_dir, file_names):
+        """
+        Copy the given files from the origin folder to the destiny folder
+        Within the same filesystem the kernel copies them (shutil.copyfile),
+        avoiding the rsync process, otherwise they are copied with rsync
+        """
+        if not (
+            os.path.isdir(destiny_dir)
+            and os.stat(origin_dir).st_dev == os.stat(destiny_dir).st_dev
+        ):
+            self.rsync_files(origin_dir, destiny_dir, file_names)
+            return
+
+        for file_name in file_names:
+            # Copied under a temporary name, as rsync does, so a failed
+            # copy never leaves a partial file with the final name
+            destiny_file = os.path.join(destiny_dir, file_name)
+            try:
+                shutil.copyfile(
+                    os.path.join(origin_dir, file_name), destiny_file + ".part"
+                )
+                os.replace(destiny_file + ".part", destiny_file)
+            finally:
+                if os.path.exists(destiny_file + ".part"):
+                    os.remove(destiny_file + ".part")
+        return
+
+    def rsync_files(self, origin_dir, destiny_dir, file_names):
+        """
+        Copy the given files from the origin folder to the destiny folder
+        with a single rsync call, listing them through --files-from
+        """
+        # Only needed when copying, so not imported with the module
+        import tempfile
+
+        import sysrsync
+
+        with tempfile.NamedTemporaryFile("w", suffix=".txt") as files_from:
+            files_from.write("\n".join(file_names) + "\n")
+            files_from.flush()
+            sysrsync.run(
+                source=origin_dir,
+                destination=destiny_dir,
+                options=self.conf["options"] + [f"--files-from={files_from.name}"],
+                sync_source_contents=True,
+            )
+        return
+
     def uncompress_targz_directory(self, direction):
         """
         Uncompress chosen services
@@ -806,8 +991,13 @@ class Archive:
         already_uncompressed_services = []
         not_found_compressed_services = []
         successfully_uncompressed_services = []
+        # service: directory to uncompress into
+        dirs_to_untar = {}
 
         for service in self.services.keys():
+            if self.services[service]["uncompressed"] == IDENTICAL_COPY_FOUND:
+                continue
+
             # check if errors, skip
             location_check = "Data dir" if direction == "archive" else "Archive"
             if (
@@ -849,7 +1039,7 @@ class Archive:
                 if os.path.exists(dir_to_untar):
                     stderr.print(
                         f"Service {service} is already uncompressed in the destiny"
-                        f"folder {'/'.join(dir_to_untar.split('/')[:-1])[:-1]}"
+                        f"folder {os.path.dirname(dir_to_untar)}"
                     )
 
                     prompt_response = ""
@@ -880,7 +1070,7 @@ class Archive:
                             f"folder {dir_to_untar}. Delete the uncompressed service automatically"
                             f" {message} to uncompress it again."
                         )
-                        shutil.rmtree(dir_to_untar)
+                        self.rmtree(dir_to_untar)
                         stderr.print("Deleted!")
                     else:
                         already_uncompressed_services.append(service)
@@ -893,13 +1083,44 @@ class Archive:
                         )
                         continue
 
-                stderr.print(f"Uncompressing {dir_to_untar.split('/')[-1] + '.tar.gz'}")
-
-                bu_isciii.utils.uncompress_targz_directory(
-                    dir_to_untar + ".tar.gz", dir_to_untar
-                )
+                dirs_to_untar[service] = dir_to_untar
+
+        # Services are independent, so a few of them are uncompressed at once
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.parallel_jobs
+        ) as executor:
+            uncompressions = {}
+            for service, dir_to_untar in dirs_to_untar.items():
+                log.info(f"Service {service}: uncompressing {dir_to_untar}.tar.gz")
+                uncompressions[
+                    executor.submit(
+                        bu_isciii.utils.uncompress_targz_directory,
+                        dir_to_untar + ".tar.gz",
+                        dir_to_untar,
+                    )
+                ] = service
+            stderr.print(f"Uncompressing {len(uncompressions)} services")
+
+            for uncompression in concurrent.futures.as_completed(uncompressions):
+                service = uncompressions[uncompression]
+                dir_to_untar = dirs_to_untar[service]
+                try:
+                    uncompression.result()
+                except Exception as e:
+                    stderr.print(
+                        f"[red] ERROR: Service {service} could not be uncompressed: {e}"
+                    )
+                    log.error(
+                        f"Service {service}: {dir_to_untar}.tar.gz could not be uncompressed. Reason: {e}"
+                    )
+                    self.services[service][
+                        "uncompressed"
+                    ] = f"Error while uncompressing: {e}"
+                    self.services[service][
+                        "error_status"
+                    ] = f"Error while uncompressing the directory: {e}"
+                    continue
 
-                stderr.print(f"Service {service} has been successfully uncompressed")
                 log.info(f"Service {service}: successfully uncompressed")
                 os.remove(dir_to_untar + ".tar.gz")
                 log.info(f"Service {service}: deleted {dir_to_untar}.tar.gz")
@@ -943,46 +1164,106 @@ class Archive:
 
     def delete_non_archived_dirs(self):
         """
-        Check that the archived counterpart exists
+        Check that the archived counterpart exists and holds the same files
         Delete the non-archived copy
         NOTE: archived_path should NEVER have to be deleted
         """
+        verified_services = []
 
         for service in self.services.keys():
-            if not os.path.exists(self.services[service]["non_archived_path"]):
+            non_archived_path = self.services[service]["non_archived_path"]
+            archived_path = self.services[service]["archived_path"]
+            non_archived_name = os.path.basename(non_archived_path)
+            archived_name = os.path.basename(archived_path)
+            if not os.path.exists(non_archived_path):
                 stderr.print(
-                    f"Service {self.services[service]['non_archived_path'].split('/')[-1]}"
+                    f"Service {non_archived_name}"
                     "has already been removed from"
-                    f"{'/'.join(self.services[service]['non_archived_path'].split('/')[:-1])[:-1]}."
+                    f"{os.path.dirname(non_archived_path)}."
                     "Nothing to delete so skipping.\n"
                 )
                 log.info(
-                    f"Service {self.services[service]['non_archived_path'].split('/')[-1]} "
+                    f"Service {non_archived_name} "
                     "has already been removed from"
-                    f"{'/'.join(self.services[service]['non_archived_path'].split('/')[:-1])[:-1]}."
+                    f"{os.path.dirname(non_archived_path)}."
                     "Nothing to delete so skipping.\n"
                 )
                 continue
             else:
-                if not os.path.exists(self.services[service]["archived_path"]):
+                if not os.path.exists(archived_path):
                     stderr.print(
-                        f"Archived path for service {self.services[service]['archived_path'].split('/')[-1]}"
+                        f"Archived path for service {archived_name}"
                         " does NOT exist. Skipping.\n"
                     )
                     log.info(
-                        f"Archived path for service {self.services[service]['archived_path'].split('/')[-1]}"
+                        f"Archived path for service {archived_name}"
                         " does NOT exist. Skipping.\n"
                     )
                 else:
+                    try:
+                        identical = bu_isciii.utils.dir_comparison(
+                            archived_path,
+                            non_archived_path,
+                            deep=self.deep_compare,
+                            max_workers=self.parallel_scans,
+                        )
+                    except OSError as e:
+                        identical = False
+                        log.error(
+                            f"Service {service}: archived and non_archived copies could not be compared: {e}"
+                        )
+                    if not identical:
+                        stderr.print(
+                            f"[red] ERROR: Archived path for service {archived_name}"
+                            " does NOT match its non_archived copy. Skipping.\n"
+                        )
+                        log.info(
+                            f"Archived path for service {archived_name}"
+                            " does NOT match its non_archived copy. Skipping.\n"
+                        )
+                        self.services[service][
+                            "error_status"
+                        ] = "Archived and non archived copies do not match. Not deleted."
+                        continue
                     stderr.print(
-                        f"Found archived path for service {self.services[service]['archived_path'].split('/')[-1]}."
+                        f"Found archived path for service {archived_name}."
                         "It is safe to delete this non_archived service. Deleting.\n"
                     )
                     log.info(
-                        f"Found archived path for service {self.services[service]['archived_path'].split('/')[-1]}."
+                        f"Found archived path for service {archived_name}."
                         "It is safe to delete this non_archived service. Deleting.\n"
                     )
-                    shutil.rmtree(self.services[service]["non_archived_path"])
+                    verified_services.append(service)
+
+        # Trees of different services are independent, and removing them is bound
+        # by unlink/rmdir syscalls, so they are deleted concurrently
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.parallel_delete
+        ) as executor:
+            deletions = {
+                executor.submit(
+                    self.rmtree, self.services[service]["non_archived_path"]
+                ): service
+                for service in verified_services
+            }
+            for deletion in concurrent.futures.as_completed(deletions):
+                service = deletions[deletion]
+                try:
+                    deletion.result()
+                    self.services[service]["deleted"] = "Successfully deleted"
+                    log.info(
+                        f"Service {service}: deleted {self.services[service]['non_archived_path']}"
+                    )
+                except OSError as e:
+                    stderr.print(
+                        f"[red] ERROR: Service {service} could not be deleted from "
+                        f"{self.services[service]['non_archived_path']}: {e}"
+                    )
+                    log.error(
+                        f"Service {service}: {self.services[service]['non_archived_path']} "
+                        f"could not be deleted. Reason: {e}"
+                    )
+                    self.services[service]["deleted"] = f"Error while deleting: {e}"
         return
 
     def generate_tsv_table(self, filename):
@@ -991,7 +1272,7 @@ class Archive:
         """
 
         if os.path.exists(filename):
-            new_filename = filename.split(".")[0] + ".1.tsv"
+            new_filename = os.path.splitext(filename)[0] + ".1.tsv"
             stderr.print(
                 f"A tsv file named {filename} has already been found. Changing name to {new_filename}."
             )
@@ -1113,64 +1394,55 @@ class Archive:
         """
         Handle archive class options
         """
-        if self.option == "Scout for service size":
-            self.scout_directory_sizes()
-            self.generate_tsv_table(filename=self.output_name)
-
-        elif self.option == "Full archive: compress and archive":
-            self.scout_directory_sizes()
-            self.targz_directory(direction="archive")
-            self.sync_directory(direction="archive")
-            self.uncompress_targz_directory(direction="archive")
-            self.generate_tsv_table(filename=self.output_name)
-
-        elif self.option.lstrip() == "Partial archive: compress NON-archived service":
-            self.scout_directory_sizes()
-            self.targz_directory(direction="archive")
-            self.generate_tsv_table(filename=self.output_name)
-
-        elif (
-            self.option.lstrip()
-            == "Partial archive: archive NON-archived service (must be compressed first) and check md5"
-        ):
-            self.sync_directory(direction="archive")
-            self.generate_tsv_table(filename=self.output_name)
-
-        elif (
-            self.option.lstrip()
-            == "Partial archive: uncompress newly archived compressed service"
-        ):
-            self.uncompress_targz_directory(direction="archive")
-            self.generate_tsv_table(filename=self.output_name)
-
-        elif self.option == "Full retrieve: retrieve and uncompress":
-            self.targz_directory(direction="retrieve")
-            self.sync_directory(direction="retrieve")
-            self.uncompress_targz_directory(direction="retrieve")
-            self.generate_tsv_table(filename=self.output_name)
-
-        elif self.option.lstrip() == "Partial retrieve: compress archived service":
-            self.targz_directory(direction="retrieve")
-            self.generate_tsv_table(filename=self.output_name)
-
-        elif (
-            self.option.lstrip()
-            == "Partial retrieve: retrieve archived service (must be compressed first) and check md5"
-        ):
-            self.sync_directory(direction="retrieve")
-            self.generate_tsv_table(filename=self.output_name)
-
-        elif self.option.lstrip() == "Partial retrieve: uncompress retrieved service":
-            self.uncompress_targz_directory(direction="retrieve")
-            self.generate_tsv_table(filename=self.output_name)
+        if self.option == "That should be all, thank you!":
+            sys.exit()
 
-        elif (
-            self.option
-            == "Remove selected services from data dir (only if they are already in archive dir)"
-        ):
-            self.delete_non_archived_dirs()
-            self.generate_tsv_table(filename=self.output_name)
+        scout = self.scout_directory_sizes
+        archive_targz = functools.partial(self.targz_directory, direction="archive")
+        archive_sync = functools.partial(self.sync_directory, direction="archive")
+        archive_untar = functools.partial(
+            self.uncompress_targz_directory, direction="archive"
+        )
+        retrieve_targz = functools.partial(self.targz_directory, direction="retrieve")
+        retrieve_sync = functools.partial(self.sync_directory, direction="retrieve")
+        retrieve_untar = functools.partial(
+            self.uncompress_targz_directory, direction="retrieve"
+        )
+        # Steps run for each option, partial options are matched without indent
+        option_steps = {
+            "Scout for service size": (scout,),
+            "Full archive: compress and archive": (
+                scout,
+                archive_targz,
+                archive_sync,
+                archive_untar,
+            ),
+            "Partial archive: compress NON-archived service": (scout, archive_targz),
+            "Partial archive: archive NON-archived service (must be compressed first) and check md5": (
+                archive_sync,
+            ),
+            "Partial archive: uncompress newly archived compressed service": (
+                archive_untar,
+            ),
+            "Full retrieve: retrieve and uncompress": (
+                retrieve_targz,
+                retrieve_sync,
+                retrieve_untar,
+            ),
+            "Partial retrieve: compress archived service": (retrieve_targz,),
+            "Partial retrieve: retrieve archived service (must be compressed first) and check md5": (
+                retrieve_sync,
+            ),
+            "Partial retrieve: uncompress retrieved service": (retrieve_untar,),
+            "Remove selected services from data dir (only if they are already in archive dir)": (
+                self.delete_non_archived_dirs,
+            ),
+        }
 
-        elif self.option == "That should be all, thank you!":
-            sys.exit()
+        steps = option_steps.get(self.option.lstrip())
+        if steps is None:
+            return
+        for step in steps:
+            step()
+        self.generate_tsv_table(filename=self.output_name)
         return
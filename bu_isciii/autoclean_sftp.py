@@ -1,14 +1,12 @@
 #!/usr/bin/env python
 
 # import
+import concurrent.futures
 import os
 import re
 import sys
 import logging
 
-import shutil
-import rich
-
 from datetime import datetime, timedelta
 
 # local import
@@ -17,12 +15,7 @@ import bu_isciii.utils
 import bu_isciii.config_json
 
 log = logging.getLogger(__name__)
-stderr = rich.console.Console(
-    stderr=True,
-    style="dim",
-    highlight=False,
-    force_terminal=bu_isciii.utils.rich_force_colors(),
-)
+stderr = bu_isciii.utils.stderr
 
 
 # TODO: add to utils.py?
@@ -34,25 +27,40 @@ def timestamp_converter(timestamp):
 class LastMofdificationFinder:
     """
     Identifies the lates modification in a directory
+    If given a cutoff timestamp, stops at the first modification after it
     """
 
-    def __init__(self, path):
+    def __init__(self, path, cutoff=None):
         self.path = path
+        self.cutoff = cutoff
         self.last_modified_time = 0
 
     def find_last_modification(self):
+        # Returned as a timestamp, converted to a date only to be printed.
+        # None if the service folder itself cannot be read
         self.get_last_modified(self.path)
-        return timestamp_converter(self.last_modified_time)
+        return self.last_modified_time
 
     def get_last_modified(self, directory):
-        last_modified_time = os.path.getmtime(directory)
-
-        for root, dirs, files in os.walk(self.path):
-            for file in files:
-                file_path = os.path.join(root, file)
-                file_modified_time = os.path.getmtime(file_path)
-                if file_modified_time > last_modified_time:
-                    last_modified_time = file_modified_time
+        # The directory's own mtime is kept so that empty services are not
+        # dated at the epoch. Files are stat'ed through their scandir entries.
+        # Links are never followed: their own mtime counts, not their target's
+        try:
+            last_modified_time = os.lstat(directory).st_mtime
+        except OSError as e:
+            log.warning(f"Error while reading service folder: {e}")
+            self.last_modified_time = None
+            return
+
+        for entry in bu_isciii.utils.scan_dir_files(directory):
+            try:
+                file_modified_time = entry.stat(follow_symlinks=False).st_mtime
+            except OSError:
+                continue
+            if file_modified_time > last_modified_time:
+                last_modified_time = file_modified_time
+            if self.cutoff is not None and last_modified_time > self.cutoff:
+                break
 
         if last_modified_time > self.last_modified_time:
             self.last_modified_time = last_modified_time
@@ -81,6 +89,14 @@ class AutoremoveSftpService:
         else:
             self.path = path
 
+        # Pool sizes are shared with archive, which walks and deletes the same
+        # kind of service trees
+        if conf is None:
+            conf = bu_isciii.config_json.ConfigJson()
+        conf_archive = conf.get_configuration("archive")
+        self.parallel_scans = conf_archive.get("parallel_scans", 16)
+        self.parallel_delete = max(1, int(conf_archive.get("parallel_delete", 1)))
+
         # Define the margin threshold of days to mark old services
         self.days = timedelta(days=days)
         stderr.print(
@@ -90,49 +106,81 @@ class AutoremoveSftpService:
             + self.path
         )
 
-    # TODO: modify this. PR to make this method reusable outside the class
-    def check_path_exists(self):
-        # if the folder path is not found, then bye
-        if not os.path.exists(self.path):
-            stderr.print(
-                "[red]ERROR: It seems like finding the correct path is beneath me. I apologise. The path:"
-                + self.path
-                + "does not exitst. Exiting.." % self.path
-            )
-            sys.exit()
-        else:
-            return True
+    # if the folder path is not found, then bye
+    def exit_path_not_found(self):
+        stderr.print(
+            "[red]ERROR: It seems like finding the correct path is beneath me. I apologise. The path: "
+            + self.path
+            + " does not exist. Exiting.."
+        )
+        sys.exit()
 
     # Uses regex to identify sftp-services & gets their lates modification
     def get_sftp_services(self):
-        self.sftp_services = {}  # {sftp-service_path : last_update}
+        self.sftp_services = {}  # {sftp-service_path : last_update timestamp}
         service_pattern = (
             r"^[SRV][A-Z]+[0-9]+_\d{8}_[A-Z0-9.-]+_[a-zA-Z]+(?:\.[a-zA-Z]+)?_[a-zA-Z]$"
         )
 
+        # Services modified after the cutoff are kept, so their scan stops
+        # at the first modification found after it
+        self.cutoff = (datetime.now() - self.days).timestamp()
+
         stderr.print("[blue]Scanning " + self.path + "...")
-        for root, dirs, files in os.walk(self.path):
-            for dir_name in dirs:
-                match = re.match(service_pattern, dir_name)
-                if match:
-                    sftp_service_fullPath = os.path.join(root, dir_name)
-
-                    # Get sftp-service last modification
-                    service_finder = LastMofdificationFinder(sftp_service_fullPath)
-                    service_last_modification = service_finder.find_last_modification()
-                    self.sftp_services[sftp_service_fullPath] = (
-                        service_last_modification
-                    )
+
+        # Only directories are looked at, using the type cached in their
+        # scandir entry. Services are scanned by their own finder, so the
+        # walk does not go into them
+        def service_dir(entry):
+            return entry.is_dir(follow_symlinks=False) and re.match(
+                service_pattern, entry.name
+            )
+
+        def exit_if_sftp_path(error):
+            # The sftp path itself must be readable, folders inside it need not
+            if error.filename == self.path:
+                self.exit_path_not_found()
+            log.warning(f"Error while scanning directory: {error}")
+
+        sftp_service_paths = [
+            entry.path
+            for entry in bu_isciii.utils.scan_dir_tree(
+                self.path,
+                descend=lambda entry: not service_dir(entry),
+                onerror=exit_if_sftp_path,
+            )
+            if service_dir(entry)
+        ]
+
+        # Get sftp-services last modification. Each scan is an independent
+        # walk bound by stat syscalls, so they run concurrently
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.parallel_scans
+        ) as executor:
+            service_last_modifications = executor.map(
+                lambda service_path: LastMofdificationFinder(
+                    service_path, self.cutoff
+                ).find_last_modification(),
+                sftp_service_paths,
+            )
+            # Services removed or unreadable since they were listed are skipped
+            self.sftp_services = {
+                service_path: last_modification
+                for service_path, last_modification in zip(
+                    sftp_service_paths, service_last_modifications
+                )
+                if last_modification is not None
+            }
         if len(self.sftp_services) == 0:
             sys.exit(f"No services found in {self.path}")
 
     # Mark services older than $days
     def mark_toDelete(self):
-        self.marked_services = []
-
-        for key, value in self.sftp_services.items():
-            if datetime.now() - value > self.days:
-                self.marked_services.append(key)
+        self.marked_services = [
+            service
+            for service, last_update in self.sftp_services.items()
+            if last_update < self.cutoff
+        ]
 
     # Delete marked services
     def remove_oldservice(self):
@@ -144,7 +192,10 @@ class AutoremoveSftpService:
             )
             sys.exit()
         else:
-            service_elements = "\n".join(self.marked_services)
+            service_elements = "\n".join(
+                f"{service} (last modified {timestamp_converter(self.sftp_services[service])})"
+                for service in self.marked_services
+            )
             stderr.print(
                 "The following services are going to be deleted from the sftp:\n"
                 + service_elements
@@ -153,21 +204,33 @@ class AutoremoveSftpService:
                 "Are you sure?: ", dflt=False
             )
             if confirm_sftp_delete:
-                for service in self.marked_services:
-                    try:
-                        stderr.print("Deleting service: " + service)
-                        shutil.rmtree(service)
-
-                    except OSError:
-                        stderr.print(
-                            "[red]ERROR: Cannot delete service folder:" + service
-                        )
+                stderr.print(f"Deleting {len(self.marked_services)} services...")
+                # Service trees are independent and removing them is bound by
+                # unlink syscalls, so they are deleted concurrently. Outcomes
+                # are printed together once every service is handled
+                deletion_lines = []
+                rmtree = bu_isciii.utils.get_rmtree(self.parallel_delete)
+                with concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.parallel_delete
+                ) as executor:
+                    deletions = {
+                        executor.submit(rmtree, service): service
+                        for service in self.marked_services
+                    }
+                    for deletion, service in deletions.items():
+                        try:
+                            deletion.result()
+                            deletion_lines.append("Deleted service: " + service)
+                        except OSError:
+                            deletion_lines.append(
+                                "[red]ERROR: Cannot delete service folder:" + service
+                            )
+                stderr.print("\n".join(deletion_lines))
             else:
                 stderr.print("Aborting ...")
                 sys.exit()
 
     def handle_autoclean_sftp(self):
-        self.check_path_exists()
         self.get_sftp_services()
         self.mark_toDelete()
         self.remove_oldservice()
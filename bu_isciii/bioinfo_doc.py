@@ -3,7 +3,6 @@
 # Generic imports
 from datetime import datetime
 import logging
-import rich.console
 import os
 import re
 import sys
@@ -28,12 +27,7 @@ import bu_isciii.drylab_api
 import bu_isciii.service_json
 
 log = logging.getLogger(__name__)
-stderr = rich.console.Console(
-    stderr=True,
-    style="dim",
-    highlight=False,
-    force_terminal=bu_isciii.utils.rich_force_colors(),
-)
+stderr = bu_isciii.utils.stderr
 
 
 class BioinfoDoc:
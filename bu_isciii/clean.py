@@ -5,7 +5,6 @@ import sys
 import os
 import logging
 import shutil
-from rich.console import Console
 
 # Local imports
 import bu_isciii
@@ -14,12 +13,7 @@ import bu_isciii.drylab_api
 import bu_isciii.service_json
 
 log = logging.getLogger(__name__)
-stderr = Console(
-    stderr=True,
-    style="dim",
-    highlight=False,
-    force_terminal=bu_isciii.utils.rich_force_colors(),
-)
+stderr = bu_isciii.utils.stderr
 
 
 class CleanUp:
@@ -221,12 +215,15 @@ class CleanUp:
         # TODO: This has to be revisite if it takes to long.
         # I've tried to continue if found, but I guess there could be several work folders in the project.. Let's see how it goes
         for root, dirs, files in os.walk(self.full_path):
+            # File paths are built once per file, joining the root only once,
+            # instead of once for every item to find
+            root_prefix = os.path.join(root, "")
+            file_paths = [root_prefix + file for file in files]
             for item_to_be_found in to_find:
                 if root.endswith(item_to_be_found):
                     pathlist.append(root)
                     found.append(item_to_be_found)
-                for file in files:
-                    path = os.path.join(root, file)
+                for path in file_paths:
                     if path.endswith(item_to_be_found):
                         pathlist.append(path)
                         found.append(item_to_be_found)
@@ -260,9 +257,7 @@ class CleanUp:
         for root, dirs, files in os.walk(self.full_path):
             for name in dirs:
                 if name == "work":
-                    if os.path.exists(os.path.join(root, name)):
-                        workdir = os.path.join(root, name)
-                        workdirs.append(workdir)
+                    workdirs.append(os.path.join(root, name))
         return workdirs
 
     def rename(self, to_find, add, verbose=True):
@@ -284,24 +279,40 @@ class CleanUp:
             sys.exit()
 
         path_content = self.scan_dirs(to_find=to_find)
-        unfiltered_path_content = [f.path for f in os.scandir(self.full_path)]
+        # Items are renamed relative to their parent directory, which is
+        # opened (and listed, to find previous renamings) once for all of them
+        parent_names = {}
         for directory_to_rename in path_content:
-            renamed_directory = str(directory_to_rename + add)
-            if renamed_directory in unfiltered_path_content:
-                stderr.print(
-                    "[orange]WARNING: Directory %s already renamed to %s Omitting..."
-                    % (directory_to_rename, renamed_directory)
-                )
-                continue
-            else:
-                newpath = directory_to_rename + add
-                try:
-                    os.replace(directory_to_rename, newpath)
-                    if verbose:
-                        print(f"Renamed {directory_to_rename} to {newpath}.")
-                except PermissionError as e:
-                    print(f"Error moving {directory_to_rename} to {newpath}: {e}")
-                    sys.exit()
+            parent_names.setdefault(os.path.dirname(directory_to_rename), []).append(
+                os.path.basename(directory_to_rename)
+            )
+        for parent, names in parent_names.items():
+            parent_fd = os.open(parent, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                parent_content = set(os.listdir(parent_fd))
+                for name in names:
+                    directory_to_rename = os.path.join(parent, name)
+                    newpath = directory_to_rename + add
+                    if name + add in parent_content:
+                        stderr.print(
+                            "[orange]WARNING: Directory %s already renamed to %s Omitting..."
+                            % (directory_to_rename, newpath)
+                        )
+                        continue
+                    try:
+                        os.replace(
+                            name,
+                            name + add,
+                            src_dir_fd=parent_fd,
+                            dst_dir_fd=parent_fd,
+                        )
+                        if verbose:
+                            print(f"Renamed {directory_to_rename} to {newpath}.")
+                    except PermissionError as e:
+                        print(f"Error moving {directory_to_rename} to {newpath}: {e}")
+                        sys.exit()
+            finally:
+                os.close(parent_fd)
         return
 
     def purge_files(self):
@@ -328,7 +339,7 @@ class CleanUp:
                 stderr.print("[green]Successfully removed " + file)
         return
 
-    def purge_folders(self, sacredtexts=["lablog", "logs"], add="", verbose=True):
+    def purge_folders(self, sacredtexts=("lablog", "logs"), add="", verbose=True):
         """
         Description:
             Remove the files that must be deleted for the delivery of the service
@@ -339,24 +350,27 @@ class CleanUp:
             object.purge_folders()
 
         Params:
-            sacredtexts [list]: names (str) of the files that shall not be deleted.
+            sacredtexts [iterable]: names (str) of the files that shall not be deleted.
 
         """
+        sacredtexts = frozenset(sacredtexts)
         path_content = self.scan_dirs(to_find=self.delete_folders)
 
         for directory in path_content:
             # if not empty, and not previously DEL add it to the content
             if not directory.endswith(add):
-                for item in os.listdir(directory):
-                    if item not in sacredtexts:
-                        item_path = os.path.join(directory, item)
-                        # shutil if dir, os.remove if file
-                        if os.path.isdir(item_path):
-                            shutil.rmtree(item_path)
-                        else:
-                            os.remove(item_path)
-                        if verbose:
-                            print(f"Removed {item}.")
+                # Only the folder's own children are removed, its scandir
+                # entries already hold their path and type
+                with os.scandir(directory) as items:
+                    for item in items:
+                        if item.name not in sacredtexts:
+                            # shutil if dir, os.remove if file or link
+                            if item.is_dir(follow_symlinks=False):
+                                shutil.rmtree(item.path)
+                            else:
+                                os.remove(item.path)
+                            if verbose:
+                                print(f"Removed {item.name}.")
         return
 
     def delete_work(self):
@@ -377,7 +391,7 @@ class CleanUp:
         else:
             stderr.print("There is no work folder here")
 
-    def delete(self, verbose=True, sacredtexts=["lablog", "logs"], add="_DEL"):
+    def delete(self, verbose=True, sacredtexts=("lablog", "logs"), add="_DEL"):
         """
         Description:
             Remove both files and purge folders defined for the service, and rename to tag.
@@ -4,13 +4,18 @@ import os
 
 
 class ConfigJson:
+    # Parsed configuration files, shared by every instance so that each
+    # file is only read and parsed once per execution
+    json_data_cache = {}
+
     def __init__(
         self,
         json_file=os.path.join(os.path.dirname(__file__), "conf", "configuration.json"),
     ):
-        fh = open(json_file)
-        self.json_data = json.load(fh)
-        fh.close()
+        if json_file not in ConfigJson.json_data_cache:
+            with open(json_file) as fh:
+                ConfigJson.json_data_cache[json_file] = json.load(fh)
+        self.json_data = ConfigJson.json_data_cache[json_file]
         self.topic_config = list(self.json_data.keys())
 
     def get_configuration(self, topic):
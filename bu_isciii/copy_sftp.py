@@ -4,7 +4,6 @@
 import os
 import sys
 import logging
-from rich.console import Console
 import sysrsync
 from sysrsync.exceptions import RsyncError
 from datetime import datetime
@@ -16,12 +15,7 @@ import bu_isciii.drylab_api
 import bu_isciii.service_json
 
 log = logging.getLogger(__name__)
-stderr = Console(
-    stderr=True,
-    style="dim",
-    highlight=False,
-    force_terminal=bu_isciii.utils.rich_force_colors(),
-)
+stderr = bu_isciii.utils.stderr
 
 
 class CopySftp:
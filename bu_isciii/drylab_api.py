@@ -3,16 +3,10 @@ import logging
 import json
 import requests
 import sys
-import rich
 import bu_isciii.utils
 
 log = logging.getLogger(__name__)
-stderr = rich.console.Console(
-    stderr=True,
-    style="dim",
-    highlight=False,
-    force_terminal=bu_isciii.utils.rich_force_colors(),
-)
+stderr = bu_isciii.utils.stderr
 
 
 class RestServiceApi:
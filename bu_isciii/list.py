@@ -5,7 +5,6 @@ import re
 import logging
 import rich.table
 import rich.console
-from rich.console import Console
 
 # Local imports
 import bu_isciii
@@ -13,12 +12,7 @@ import bu_isciii.utils
 from bu_isciii.service_json import ServiceJson
 
 log = logging.getLogger(__name__)
-stderr = Console(
-    stderr=True,
-    style="dim",
-    highlight=False,
-    force_terminal=bu_isciii.utils.rich_force_colors(),
-)
+stderr = bu_isciii.utils.stderr
 
 
 def generate_table(service_list, data_dictionary):
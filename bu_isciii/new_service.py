@@ -7,7 +7,6 @@ import logging
 import glob
 import json
 import shutil
-import rich
 
 # Local imports
 import bu_isciii
@@ -17,12 +16,7 @@ import bu_isciii.service_json
 import bu_isciii.drylab_api
 
 log = logging.getLogger(__name__)
-stderr = rich.console.Console(
-    stderr=True,
-    style="dim",
-    highlight=False,
-    force_terminal=bu_isciii.utils.rich_force_colors(),
-)
+stderr = bu_isciii.utils.stderr
 
 
 class NewService:
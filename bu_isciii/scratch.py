@@ -8,7 +8,6 @@ import re
 import subprocess
 import sysrsync
 
-import rich
 import shutil
 
 # Local imports
@@ -18,12 +17,7 @@ import bu_isciii.drylab_api
 import bu_isciii.config_json
 
 log = logging.getLogger(__name__)
-stderr = rich.console.Console(
-    stderr=True,
-    style="dim",
-    highlight=False,
-    force_terminal=bu_isciii.utils.rich_force_colors(),
-)
+stderr = bu_isciii.utils.stderr
 
 
 class Scratch:
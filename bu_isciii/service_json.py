@@ -4,13 +4,18 @@ import os
 
 
 class ServiceJson:
+    # Parsed services files, shared by every instance so that each file is
+    # only read and parsed once per execution
+    json_data_cache = {}
+
     def __init__(
         self,
         json_file=os.path.join(os.path.dirname(__file__), "templates", "services.json"),
     ):
-        fh = open(json_file)
-        self.json_data = json.load(fh)
-        fh.close()
+        if json_file not in ServiceJson.json_data_cache:
+            with open(json_file) as fh:
+                ServiceJson.json_data_cache[json_file] = json.load(fh)
+        self.json_data = ServiceJson.json_data_cache[json_file]
         self.service_list = list(self.json_data.keys())
 
     def get_json_data(self):
@@ -32,9 +37,7 @@ class ServiceJson:
         Description:
             Obtain the service configuration from json data
         """
-        if service in self.service_list:
-            return self.json_data[service]
-        return None
+        return self.json_data.get(service)
 
     def get_find(self, service, found):
         """
@@ -66,7 +69,7 @@ class ServiceJson:
         return None
 
     def get_find_deep(self, service, found):
-        if service in self.service_list:
+        if service in self.json_data:
             serv_dict = self.json_data[service]
             call_aux = self.get_find_aux(serv_dict, found)
             return call_aux
@@ -85,7 +88,7 @@ class ServiceJson:
                             return data
                 return False
 
-        if service in self.service_list:
+        if service in self.json_data:
             return recursive(self.json_data[service], found_item)
         return False
 
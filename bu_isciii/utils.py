@@ -1,16 +1,21 @@
 #!/usr/bin/env python
 import logging
 import calendar
+import concurrent.futures
 import datetime
+import functools
+import gzip
 import hashlib
 import json
 import os
+import shutil
 import tarfile
 import sys
 import subprocess
+import threading
+import types
 
-import questionary
-import rich
+import rich.console
 import yaml
 
 import bu_isciii
@@ -18,26 +23,37 @@ import bu_isciii.config_json
 import bu_isciii.service_json
 
 
+@functools.lru_cache(maxsize=1)
 def rich_force_colors():
     """
     Check if any environment variables are set to force Rich to use coloured output
+    The environment is only checked once per execution
     """
-    if (
-        os.getenv("GITHUB_ACTIONS")
-        or os.getenv("FORCE_COLOR")
-        or os.getenv("PY_COLORS")
+    if any(
+        os.environ.get(variable)
+        for variable in ("GITHUB_ACTIONS", "FORCE_COLOR", "PY_COLORS")
     ):
         return True
     return None
 
 
 log = logging.getLogger(__name__)
+# Console shared by every bu_isciii module
 stderr = rich.console.Console(
     stderr=True, style="dim", highlight=False, force_terminal=rich_force_colors()
 )
+# Undimmed console shared by the cli header, tracebacks and verbose logging
+stderr_plain = rich.console.Console(stderr=True, force_terminal=rich_force_colors())
+
+# Month number and name pairs: ((1, "January"), (2, "February"), ...)
+MONTHS = tuple(enumerate(calendar.month_name))[1:]
 
 
+# questionary loads prompt_toolkit, which is slow to import, so each prompt
+# imports it when asked, keeping the cli start up fast
 def prompt_resolution_id():
+    import questionary
+
     stderr.print(
         "Specify the name resolution id for the service you want to create."
         "You can obtain this from iSkyLIMS. eg. SRVCNM564.1"
@@ -47,6 +63,8 @@ def prompt_resolution_id():
 
 
 def prompt_service_id():
+    import questionary
+
     stderr.print(
         "Specify the name service ID for the service you want to create."
         "You can obtain this from iSkyLIMS. eg. SRVCNM564"
@@ -62,6 +80,8 @@ def prompt_year(lower_limit, upper_limit):
     Check whether or not this input is within the limits
     Maybe too specific for utils
     """
+    import questionary
+
     while True:
         year = questionary.text(f"Year ({lower_limit}-{upper_limit})").unsafe_ask()
 
@@ -100,6 +120,8 @@ def prompt_day(lower_limit, upper_limit):
     Maybe too specific for utils
     And similar to the prompt_year function (different context tho)
     """
+    import questionary
+
     while True:
         day = questionary.text(f"Day ({lower_limit} - {upper_limit})").unsafe_ask()
         try:
@@ -118,45 +140,61 @@ def prompt_day(lower_limit, upper_limit):
 
 
 def prompt_service_dir_path():
+    import questionary
+
     stderr.print("Service path to copy to execution temporal directory")
     source = questionary.path("Source path").unsafe_ask()
     return source
 
 
 def prompt_tmp_dir_path():
+    import questionary
+
     stderr.print("Temporal directory destination to execute sercive")
     source = questionary.path("Source path").unsafe_ask()
     return source
 
 
 def prompt_source_path():
+    import questionary
+
     stderr.print("Directory containing files cd to transfer")
     source = questionary.path("Source path").unsafe_ask()
     return source
 
 
 def prompt_destination_path():
+    import questionary
+
     stderr.print("Directory to which the files will be transfered")
     destination = questionary.path("Destination path").unsafe_ask()
     return destination
 
 
 def prompt_selection(msg, choices):
+    import questionary
+
     selection = questionary.select(msg, choices=choices).unsafe_ask()
     return selection
 
 
 def prompt_path(msg):
+    import questionary
+
     source = questionary.path(msg).unsafe_ask()
     return source
 
 
 def prompt_yn_question(msg, dflt):
+    import questionary
+
     confirmation = questionary.confirm(msg, default=dflt).unsafe_ask()
     return confirmation
 
 
 def prompt_skip_folder_creation():
+    import questionary
+
     stderr.print("Do you want to skip folder creation? (y/N)")
     confirmation = questionary.confirm("Skip?", default=False).unsafe_ask()
     return confirmation
@@ -191,44 +229,30 @@ def get_service_ids(services_requested):
 
 
 def ask_for_some_text(msg):
+    import questionary
+
     input_text = questionary.text(msg).unsafe_ask()
     return input_text
 
 
 def ask_password(msg):
+    import questionary
+
     password = questionary.password(msg).unsafe_ask()
     return password
 
 
-def get_service_paths(conf, type, info, archived_status):
+def get_service_user_path(info):
     """
-    Given a service, a conf and a type,
-    get the path it would have service
+    Given a service, get the center and classification area
+    folders of the profile of the user who requested it
     """
-    global_conf = conf.get_configuration("global")
-    service_path = None
-
+    profile = info["service_user_id"]["profile"]
     try:
-        if type == "services_and_colaborations":
-            if archived_status == "archived_path":
-                service_path = os.path.join(
-                    global_conf["archived_path"],
-                    type,
-                    info["service_user_id"]["profile"]["profile_center"],
-                    info["service_user_id"]["profile"][
-                        "profile_classification_area"
-                    ].lower(),
-                )
-            if archived_status == "non_archived_path":
-                service_path = os.path.join(
-                    global_conf["data_path"],
-                    type,
-                    info["service_user_id"]["profile"]["profile_center"],
-                    info["service_user_id"]["profile"][
-                        "profile_classification_area"
-                    ].lower(),
-                )
-        return service_path
+        return os.path.join(
+            profile["profile_center"],
+            profile["profile_classification_area"].lower(),
+        )
 
     except AttributeError:
         stderr.print(
@@ -237,6 +261,22 @@ def get_service_paths(conf, type, info, archived_status):
         sys.exit(1)
 
 
+def get_service_paths(conf, type, info, archived_status):
+    """
+    Given a service, a conf and a type,
+    get the path it would have service
+    """
+    # Configuration key holding the root folder for each archived status
+    root_key = {"archived_path": "archived_path", "non_archived_path": "data_path"}
+    if type != "services_and_colaborations" or archived_status not in root_key:
+        return None
+
+    global_conf = conf.get_configuration("global")
+    return os.path.join(
+        global_conf[root_key[archived_status]], type, get_service_user_path(info)
+    )
+
+
 def get_sftp_folder(conf, resolution_info):
     service_user = resolution_info["service_user_id"]["username"]
     json_file = os.path.join(os.path.dirname(__file__), "templates", "sftp_user.json")
@@ -282,52 +322,439 @@ def append_end_to_service_id_list(services_requested):
     return service_ids_requested
 
 
+def scan_dir_tree(path, descend=None, onerror=None):
+    """
+    Walk a directory tree with os.scandir, yielding the entry of every item
+    below path. Symbolic links are not followed
+    Directories are entered unless descend(entry) returns False. Those that
+    cannot be read are passed to onerror and skipped, as os.walk does; by
+    default a warning is logged
+    """
+    pending_dirs = [path]
+
+    while pending_dirs:
+        current_dir = pending_dirs.pop()
+        try:
+            with os.scandir(current_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False) and (
+                        descend is None or descend(entry)
+                    ):
+                        pending_dirs.append(entry.path)
+                    yield entry
+        except OSError as e:
+            if onerror is None:
+                log.warning(f"Error while scanning directory: {e}")
+            else:
+                onerror(e)
+
+
+def scan_dir_files(path):
+    """
+    Walk a directory tree with os.scandir, yielding the entry of every
+    non-directory item
+    """
+    for entry in scan_dir_tree(path):
+        if not entry.is_dir(follow_symlinks=False):
+            yield entry
+
+
+def parallel_rmtree(path, max_workers=32):
+    """
+    Delete a directory tree like shutil.rmtree, unlinking its files
+    concurrently to hide the latency of network filesystems
+    Symbolic links are removed, never followed
+    """
+    if os.path.islink(path):
+        raise OSError(f"Cannot delete a symbolic link as a tree: {path}")
+
+    # Directories are found parents first, so they are removed in reverse
+    tree_dirs = [path]
+    tree_files = []
+    for tree_dir in tree_dirs:
+        with os.scandir(tree_dir) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    tree_dirs.append(entry.path)
+                else:
+                    tree_files.append(entry.path)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Consume the results so that any unlink error is raised
+        for _ in executor.map(os.unlink, tree_files):
+            pass
+
+    for tree_dir in reversed(tree_dirs):
+        os.rmdir(tree_dir)
+
+
+def get_rmtree(parallel_delete):
+    """
+    Get the function deleting directory trees for the configured number of
+    delete workers: shutil.rmtree for one, parallel_rmtree for more, whose
+    concurrent unlinks pay off on network filesystems
+    """
+    if parallel_delete > 1:
+        return functools.partial(parallel_rmtree, max_workers=parallel_delete)
+    return shutil.rmtree
+
+
 def get_dir_size(path):
     """
     Get the size in bytes of a given directory
     """
     size = 0
 
-    for path, dirs, files in os.walk(path):
-        for file in files:
-            try:
-                if os.path.islink(os.path.join(path, file)):
-                    size += os.lstat(os.path.join(path, file)).st_size
-                else:
-                    size += os.path.getsize(os.path.join(path, file))
-            except FileNotFoundError as e:
-                log.warning(f"File not found error while scouting size: {e}")
+    for entry in scan_dir_files(path):
+        try:
+            size += entry.stat(follow_symlinks=False).st_size
+        except OSError as e:
+            log.warning(f"Error while scouting size: {e}")
 
     return size
 
 
-def targz_dir(tar_name, directory):
+def get_file_hash(file_path, chunk_size=1024 * 1024):  # 1 MB
     """
-    Generate a tar gz file with the contents of a directory
+    Given a file, digest it with blake2b to check its integrity
+    Symbolic links are not followed, their target is digested instead
+    """
+    hash_blake2b = hashlib.blake2b(digest_size=16)
+    if os.path.islink(file_path):
+        hash_blake2b.update(os.readlink(file_path).encode())
+        return hash_blake2b.digest()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            hash_blake2b.update(chunk)
+    return hash_blake2b.digest()
+
+
+def same_file_content(file_1, file_2):
+    """
+    Check whether two files have the same content
+    """
+    return get_file_hash(file_1) == get_file_hash(file_2)
+
+
+def get_file_signature(entry, with_mtime=True):
+    """
+    Get the size in bytes, whether it is a symbolic link and the modification
+    time (in whole seconds, as stored by tar) of a non-directory DirEntry
+    Symbolic links get no modification time, as extracting a tar does not keep it
+    """
+    entry_stat = entry.stat(follow_symlinks=False)
+    if not with_mtime or entry.is_symlink():
+        return (entry_stat.st_size, entry.is_symlink(), None)
+    return (entry_stat.st_size, False, int(entry_stat.st_mtime))
+
+
+def same_dir_tree(dir_1, dir_2, with_mtime=True, matched_files=None):
+    """
+    Walk two directory trees side by side with os.scandir, one level at a time,
+    checking they hold the same names, and files with the same signature
+    Return False at the first mismatch. If a matched_files list is given, the
+    path pairs of every matched file are appended to it
+    """
+    pending_dirs = [(dir_1, dir_2)]
+
+    while pending_dirs:
+        current_dir_1, current_dir_2 = pending_dirs.pop()
+        with os.scandir(current_dir_1) as entries:
+            entries_1 = {entry.name: entry for entry in entries}
+        with os.scandir(current_dir_2) as entries:
+            entries_2 = {entry.name: entry for entry in entries}
+        if entries_1.keys() != entries_2.keys():
+            return False
+
+        for name, entry_1 in entries_1.items():
+            entry_2 = entries_2[name]
+            is_dir = entry_1.is_dir(follow_symlinks=False)
+            if is_dir != entry_2.is_dir(follow_symlinks=False):
+                return False
+            if is_dir:
+                pending_dirs.append((entry_1.path, entry_2.path))
+            elif get_file_signature(entry_1, with_mtime) != get_file_signature(
+                entry_2, with_mtime
+            ):
+                return False
+            elif matched_files is not None:
+                matched_files.append((entry_1.path, entry_2.path))
+
+    return True
+
+
+def dir_comparison(dir_1, dir_2, deep=False, max_workers=16):
     """
-    with tarfile.open(tar_name, "w:gz") as out_tar:
-        out_tar.add(directory, arcname=os.path.basename(directory))
+    Check whether two directories hold the same files with the same content
+    By default files are compared by relative path, size and modification time.
+    With deep=True, sizes are compared and then contents are hashed, overlapping
+    the disk reads in a pool of max_workers threads and stopping at the first
+    mismatch
+    """
+    if not deep:
+        return same_dir_tree(dir_1, dir_2)
+
+    matched_files = []
+    if not same_dir_tree(dir_1, dir_2, with_mtime=False, matched_files=matched_files):
+        return False
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(same_file_content, file_1, file_2)
+            for file_1, file_2 in matched_files
+        ]
+        for future in concurrent.futures.as_completed(futures):
+            if not future.result():
+                for pending in futures:
+                    pending.cancel()
+                return False
+
     return True
 
 
-def uncompress_targz_directory(tar_name, directory):
+def new_checksum_hash(algorithm):
+    """
+    Get a new hash object for the given checksum algorithm: any hashlib one,
+    or "blake3" and "xxh3_64"/"xxh3_128", if the optional blake3/xxhash
+    packages are installed
+    Algorithms without a fixed digest size (shake_128/shake_256) are rejected,
+    as their hexdigest needs a length
+    """
+    if algorithm == "blake3":
+        import blake3
+
+        return blake3.blake3(max_threads=blake3.blake3.AUTO)
+    if algorithm in ("xxh3_64", "xxh3_128"):
+        import xxhash
+
+        return getattr(xxhash, algorithm)()
+    checksum_hash = hashlib.new(algorithm)
+    if checksum_hash.digest_size == 0:
+        raise ValueError(f"{algorithm} has no fixed digest size")
+    return checksum_hash
+
+
+def cache_id_lookup(lookup):
+    """
+    Wrap a pwd/grp lookup function so each id is resolved only once
+    Unknown ids are cached too, raising a new KeyError each time
+    """
+    results = {}
+
+    def cached_lookup(key):
+        if key not in results:
+            try:
+                results[key] = lookup(key)
+            except KeyError:
+                results[key] = None
+        if results[key] is None:
+            raise KeyError(key)
+        return results[key]
+
+    return cached_lookup
+
+
+class CachedTarOwnerNames:
+    """
+    Context manager making tarfile resolve each user and group id only once
+    tarfile resolves the user and group names of every member it adds, which
+    is a network round trip per file when users come from LDAP
+    tarfile's pwd and grp modules are swapped for cached lookups while any
+    thread is inside it, and restored when the last one leaves
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = 0
+        self.modules = None
+
+    def __enter__(self):
+        with self.lock:
+            if self.users == 0:
+                self.modules = (tarfile.pwd, tarfile.grp)
+                if tarfile.pwd is not None:
+                    tarfile.pwd = types.SimpleNamespace(
+                        getpwuid=cache_id_lookup(tarfile.pwd.getpwuid),
+                        getpwnam=cache_id_lookup(tarfile.pwd.getpwnam),
+                    )
+                if tarfile.grp is not None:
+                    tarfile.grp = types.SimpleNamespace(
+                        getgrgid=cache_id_lookup(tarfile.grp.getgrgid),
+                        getgrnam=cache_id_lookup(tarfile.grp.getgrnam),
+                    )
+            self.users += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        with self.lock:
+            self.users -= 1
+            if self.users == 0:
+                tarfile.pwd, tarfile.grp = self.modules
+                self.modules = None
+
+
+cached_tar_owner_names = CachedTarOwnerNames()
+
+
+class HashingWriter:
+    """
+    Write-only file wrapper that digests the bytes written through it
+    with the given checksum algorithm (md5 by default)
+    """
+
+    def __init__(self, fileobj, algorithm="md5"):
+        self.fileobj = fileobj
+        self.name = fileobj.name
+        self.hash = new_checksum_hash(algorithm)
+
+    def write(self, data):
+        self.hash.update(data)
+        return self.fileobj.write(data)
+
+    def flush(self):
+        self.fileobj.flush()
+
+
+def targz_dir(
+    tar_name, directory, bufsize=1024 * 1024, algorithm="md5", compresslevel=6
+):
+    """
+    Generate a tar gz file with the contents of a directory
+    Return the checksum of the generated file, digested while it is written,
+    and the size in bytes of the tarred files, counted as get_dir_size does
+    The tar is written in stream mode, reading and writing bufsize (1 MB) blocks,
+    and the compressed output is buffered in blocks of the same size
+    If pigz is installed, it compresses the tar stream using all the cpus
+    Level 6 is several times faster than gzip's default 9, for a few percent
+    bigger files
+    """
+    tarred_bytes = 0
+    parent_dir = os.path.dirname(directory)
+
+    def tally_size(tarinfo):
+        # Regular files are counted from their tar member. Tar members of
+        # links and special files have no size, so their lstat size is used
+        nonlocal tarred_bytes
+        if tarinfo.isreg():
+            tarred_bytes += tarinfo.size
+        elif not tarinfo.isdir():
+            try:
+                tarred_bytes += os.lstat(os.path.join(parent_dir, tarinfo.name)).st_size
+            except OSError as e:
+                log.warning(f"Error while scouting size: {e}")
+        return tarinfo
+
+    pigz = shutil.which("pigz")
+    with cached_tar_owner_names, open(tar_name, "wb", buffering=bufsize) as out_file:
+        hashing_file = HashingWriter(out_file, algorithm)
+        if pigz is None:
+            # tarfile's "w|gz" mode does not take a compression level
+            with gzip.GzipFile(
+                filename=tar_name,
+                mode="wb",
+                compresslevel=compresslevel,
+                fileobj=hashing_file,
+            ) as gzip_file, tarfile.open(
+                fileobj=gzip_file,
+                mode="w|",
+                bufsize=bufsize,
+                copybufsize=bufsize,
+            ) as out_tar:
+                out_tar.add(
+                    directory, arcname=os.path.basename(directory), filter=tally_size
+                )
+            return hashing_file.hash.hexdigest(), tarred_bytes
+
+        # The plain tar stream is piped into pigz, and its output is copied
+        # to the file (and hashed) by a separate thread
+        pigz_process = subprocess.Popen(
+            [pigz, "-p", str(os.cpu_count()), f"-{compresslevel}", "-c"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+
+        def kill_pigz_on_error(copying):
+            # Nothing reads pigz anymore, so it would block, and the tar writer
+            # with it. Killing it breaks the pipe under the tar writer
+            if copying.exception() is not None:
+                pigz_process.kill()
+
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+                copying = executor.submit(
+                    shutil.copyfileobj, pigz_process.stdout, hashing_file, bufsize
+                )
+                copying.add_done_callback(kill_pigz_on_error)
+                try:
+                    with tarfile.open(
+                        fileobj=pigz_process.stdin,
+                        mode="w|",
+                        bufsize=bufsize,
+                        copybufsize=bufsize,
+                    ) as out_tar:
+                        out_tar.add(
+                            directory,
+                            arcname=os.path.basename(directory),
+                            filter=tally_size,
+                        )
+                except BrokenPipeError:
+                    # pigz exited early: either it was killed after a failed
+                    # copy, whose error is raised below, or it failed on its own
+                    # and its exit code is checked at the end
+                    pass
+                finally:
+                    try:
+                        pigz_process.stdin.close()
+                    except BrokenPipeError:
+                        pass
+                copying.result()
+        finally:
+            pigz_process.stdout.close()
+            return_code = pigz_process.wait()
+        if return_code != 0:
+            raise subprocess.CalledProcessError(return_code, pigz_process.args)
+    return hashing_file.hash.hexdigest(), tarred_bytes
+
+
+def uncompress_targz_directory(tar_name, directory, bufsize=1024 * 1024):  # 1 MB
     """
     Untar GZ file
+    The tar is read in stream mode, decompressed by pigz if it is installed
     """
-    with tarfile.open(tar_name) as out_tar:
-        out_tar.extractall("/".join(directory.split("/")[:-1]))
+    pigz = shutil.which("pigz")
+    if pigz is None:
+        with tarfile.open(tar_name, mode="r|gz", bufsize=bufsize) as out_tar:
+            out_tar.extractall(os.path.dirname(directory))
+        return
+
+    with subprocess.Popen(
+        [pigz, "-d", "-c", tar_name], stdout=subprocess.PIPE
+    ) as pigz_process:
+        with tarfile.open(
+            fileobj=pigz_process.stdout, mode="r|", bufsize=bufsize
+        ) as out_tar:
+            out_tar.extractall(os.path.dirname(directory))
+    if pigz_process.returncode != 0:
+        raise subprocess.CalledProcessError(pigz_process.returncode, pigz_process.args)
     return
 
 
-def get_md5(file_path, chunk_size=1 * 1024 * 1024 * 1024):  # 1 GB
+def get_checksum(file_path, algorithm="md5", chunk_size=4 * 1024 * 1024):  # 4 MB
     """
-    Given a file, open it and digest to get the md5
+    Given a file, open it and digest it with the given checksum algorithm
+    (md5 by default)
+    The file is read into a single reused buffer, so memory stays constant,
+    and the kernel is told it is read sequentially to read ahead more
     """
-    hash_md5 = hashlib.md5()
-    with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(chunk_size), b""):
-            hash_md5.update(chunk)
-    return hash_md5.hexdigest()
+    file_hash = new_checksum_hash(algorithm)
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(file_path, "rb", buffering=0) as f:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        for read_bytes in iter(lambda: f.readinto(buffer), 0):
+            file_hash.update(view[:read_bytes])
+    return file_hash.hexdigest()
 
 
 def ask_date(previous_date=None, posterior_date=None, initial_year=2010):
@@ -341,62 +768,39 @@ def ask_date(previous_date=None, posterior_date=None, initial_year=2010):
     Stored like this so that its easier to manage later
     """
 
+    today = datetime.date.today()
     lower_limit_year = initial_year if previous_date is None else previous_date.year
 
     # Range: lower_limit_year - current year
     year = bu_isciii.utils.prompt_year(
-        lower_limit=lower_limit_year, upper_limit=datetime.date.today().year
+        lower_limit=lower_limit_year, upper_limit=today.year
     )
 
     # Limit the list to the current month if year = current year
-    # This could be a one-liner:
-    # month_list = [[num, month] for num, month in enumerate(month_name)][1:] if year < date.today().year
-    # else month_list = [[num, month] for num, month in enumerate(month_name)][1:date.today().month+1]
-    # I found it easier the following way:
-    if year < datetime.date.today().year:
-        month_list = [[num, month] for num, month in enumerate(calendar.month_name)][1:]
-    else:
-        month_list = [[num, month] for num, month in enumerate(calendar.month_name)][
-            1 : datetime.date.today().month + 1
-        ]
+    upto = 12 if year < today.year else today.month
+    month_list = MONTHS[:upto]
 
     # If there is a previous date
     # and year is the same as before, limit the quantity of months
     if previous_date is not None and year == previous_date.year:
         month_list = month_list[previous_date.month - 1 :]
 
-    chosen_month_number, chosen_month_name = (
+    # Choices look like "Month 01: January", keep the number
+    chosen_month_number = int(
         bu_isciii.utils.prompt_selection(
             f"Choose the month of {year} from which start counting",
             [f"Month {num:02d}: {month}" for num, month in month_list],
         )
-        .replace("Month", "")
-        .strip()
-        .split(": ")
+        .removeprefix("Month ")
+        .partition(":")[0]
     )
-    # For the day, use "calendar":
-    # calendar.month(year, month) returns a string with the calendar
-    # Use replace to move the "\n"
-    # Use split " " to generate a list
-    # Use filter to remove empty strings that may appear
-    # Do not get the 9 first elements bc they are:
-    # "Month", "Year", "Mo", "Tu", "We", "Th", "Fr", "Sa", "Su"
-
-    day_list = list(
-        filter(
-            None,
-            calendar.month(year, int(chosen_month_number))
-            .replace("\n", " ")
-            .split(" "),
-        )
-    )[9:]
+    # Days range from the 1st to the last day of the month, given by "calendar"
+    lower_limit_day = 1
+    upper_limit_day = calendar.monthrange(year, chosen_month_number)[1]
 
     # if current month and day, limit the options to the current day
-    if (
-        year == datetime.date.today().year
-        and int(chosen_month_number) == datetime.date.today().month
-    ):
-        day_list = day_list[: datetime.date.today().day]
+    if year == today.year and chosen_month_number == today.month:
+        upper_limit_day = today.day
 
     # if previous date  & same year & same month, limit days
     if (
@@ -404,14 +808,13 @@ def ask_date(previous_date=None, posterior_date=None, initial_year=2010):
         and year == previous_date.year
         and chosen_month_number == previous_date.month
     ):
-        day_list = day_list[previous_date.day - 1 :]
+        lower_limit_day = previous_date.day
 
-    # from the list, get the first and last item as limits for the function
     day = bu_isciii.utils.prompt_day(
-        lower_limit=int(day_list[0]), upper_limit=int(day_list[-1])
+        lower_limit=lower_limit_day, upper_limit=upper_limit_day
     )
 
-    return datetime.date(int(year), int(chosen_month_number), int(day))
+    return datetime.date(int(year), chosen_month_number, int(day))
 
 
 def get_yaml_config(conf, path):